@@ -5,166 +5,409 @@ Handles conv_part_aa.txt, conv_part_ab.txt, etc.
 """
 
 import os
+import gc
+import csv
 import glob
-import json
+import argparse
+import fnmatch
+import heapq
+import shutil
+import tempfile
+import zlib
+import numpy as np
 import pandas as pd
+from collections import Counter, deque
+from contextlib import ExitStack
 from datetime import datetime
+from itertools import islice
+from operator import attrgetter, itemgetter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import sys
 
+# Run a full garbage collection after this many files
+GC_EVERY_FILES = 8
+
+# Most run files open at once while merging; stays well under typical
+# open file limits (256 on macOS)
+MERGE_FAN_IN = 64
+
 # Import from our main converter
 sys.path.append(os.path.dirname(__file__))
-from intelligent_converter import IntelligentConverter
+from intelligent_converter import IntelligentConverter, dedup_key, json_dumps
 
-def process_multiple_files(file_pattern="conv_part_*.txt"):
-    """Process all matching conversation export files"""
+def _parse_one(file_path):
+    """Parse a single export file in a worker process"""
+    converter = IntelligentConverter()
+    conversations = converter.parse_chatgpt_export(file_path)
+    
+    # Add file source info
+    source_file = os.path.basename(file_path)
+    for conv in conversations:
+        conv['source_file'] = source_file
+    
+    return conversations
+
+class NearDuplicateFilter:
+    """Spot near-duplicate conversations with MinHash signatures and LSH banding
+    
+    Each text is reduced to a MinHash signature over its character 3-grams,
+    hashed with crc32 so a given seed gives the same result in every run;
+    the signature is cut into bands, and texts sharing a band bucket are
+    candidates. A candidate only counts as a near-duplicate if the share of
+    matching signature values (estimated Jaccard) reaches the threshold.
+    """
+    
+    _PRIME = (1 << 31) - 1
+    
+    def __init__(self, threshold=0.9, num_perm=128, seed=1):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, self._PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, self._PRIME, num_perm, dtype=np.uint64)
+        
+        # Pick the band layout whose collision threshold is closest
+        self.bands, self.rows = min(
+            ((num_perm // rows, rows) for rows in range(1, num_perm + 1)),
+            key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+        self.threshold = threshold
+        self._buckets = {}
+        self._signatures = []
+    
+    def _signature(self, text):
+        text = ' '.join(text.lower().split())
+        shingles = {text[i:i + 3] for i in range(max(len(text) - 2, 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode()) & self._PRIME for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        signature = ((np.outer(hashes, self._a) + self._b) % self._PRIME).min(axis=0)
+        return signature.astype(np.uint32)  # values are below 2**31; kept for every text
+    
+    def is_duplicate(self, text):
+        """Check text against everything seen so far, remembering it if new"""
+        signature = self._signature(text)
+        keys = [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.bands)]
+        
+        for key in keys:
+            for other in self._buckets.get(key, ()):
+                if (self._signatures[other] == signature).mean() >= self.threshold:
+                    return True
+        
+        index = len(self._signatures)
+        self._signatures.append(signature)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(index)
+        return False
+
+def _find_files(file_pattern):
+    """Return sorted (path, size) pairs for files matching the pattern"""
+    directory, name_pattern = os.path.split(file_pattern)
+    
+    # Wildcards in the directory part need the full glob machinery
+    if glob.has_magic(directory):
+        return [(f, os.path.getsize(f)) for f in sorted(glob.glob(file_pattern))]
+    
+    # One scandir pass - DirEntry caches the stat result for the size.
+    # Like glob, hidden files only match patterns that start with a dot
+    show_hidden = name_pattern.startswith('.')
+    try:
+        with os.scandir(directory or '.') as it:
+            entries = [e for e in it
+                       if (show_hidden or not e.name.startswith('.'))
+                       and fnmatch.fnmatch(e.name, name_pattern) and e.is_file()]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=attrgetter('name'))
+    
+    return [(os.path.join(directory, e.name), e.stat().st_size) for e in entries]
+
+def _prefetch(files):
+    """Ask the kernel to start reading every input file ahead of the parsers"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    
+    # Best effort - a file that can't be opened is reported by its parser
+    for file_path in files:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+def _merge_runs(converter, run_files, run_dir, fan_in=MERGE_FAN_IN):
+    """Lazily merge date-sorted run files into one date-sorted row stream
+    
+    At most fan_in runs are open at once - with more, consecutive groups
+    are first merged into intermediate runs in run_dir, pass by pass.
+    """
+    run_files = list(run_files)
+    merge_pass = 0
+    while len(run_files) > fan_in:
+        merge_pass += 1
+        merged_files = []
+        for start in range(0, len(run_files), fan_in):
+            group = run_files[start:start + fan_in]
+            if len(group) == 1:
+                merged_files.append(group[0])
+                continue
+            
+            merged_file = os.path.join(run_dir, f"merge_{merge_pass}_{start // fan_in:03d}.csv")
+            converter.write_csv(_merge_open_runs(group), merged_file)
+            for run_file in group:
+                os.remove(run_file)
+            merged_files.append(merged_file)
+        run_files = merged_files
+    
+    yield from _merge_open_runs(run_files)
+
+def _merge_open_runs(run_files):
+    """Merge run files that can all be open at once, ties in run order"""
+    with ExitStack() as stack:
+        readers = [csv.DictReader(stack.enter_context(open(f, newline='', encoding='utf-8')))
+                   for f in run_files]
+        yield from heapq.merge(*readers, key=itemgetter('date'))
+
+def _write_chunks(converter, rows, output_path, chunk_size=500, max_workers=4):
+    """Stream CSV rows into chunk files of at most chunk_size records
+    
+    Chunks are handed to a small thread pool so file writes overlap with
+    merging the next chunk; at most 2 * max_workers chunks are in flight.
+    """
+    output_files = []
+    pending = deque()
+    rows = iter(rows)
+    
+    def finish(filename, future):
+        count = future.result()
+        output_files.append(filename)
+        print(f"✅ Created {filename}: {count} records, {os.path.getsize(filename)/1024:.1f}KB")
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            
+            filename = f"{output_path}_chunk_{len(output_files) + len(pending) + 1:03d}.csv"
+            pending.append((filename, ex.submit(converter.write_csv, chunk, filename)))
+            
+            if len(pending) >= 2 * max_workers:
+                finish(*pending.popleft())
+        
+        while pending:
+            finish(*pending.popleft())
+    
+    return output_files
+
+def process_multiple_files(file_pattern="conv_part_*.txt", near_dup_threshold=None,
+                           chunk_rows=500):
+    """Process all matching conversation export files
+    
+    Returns the list of CSV chunk files written (None if nothing was
+    processed). The conversations themselves are streamed to disk and no
+    longer returned.
+    """
     
     print("🔍 Batch Conversation Processor")
     print("=" * 60)
     
     # Find all matching files
-    files = sorted(glob.glob(file_pattern))
+    matches = _find_files(file_pattern)
+    files = [path for path, _ in matches]
     
     if not files:
         print(f"❌ No files found matching pattern: {file_pattern}")
         return
     
     print(f"📁 Found {len(files)} files to process:")
-    for f in files:
-        size_mb = os.path.getsize(f) / (1024 * 1024)
+    for f, size in matches:
+        size_mb = size / (1024 * 1024)
         print(f"  - {f} ({size_mb:.1f} MB)")
     
     # Initialize converter
     converter = IntelligentConverter()
-    all_conversations = []
-    
-    # Process each file
-    for i, file_path in enumerate(files, 1):
-        print(f"\n📖 Processing file {i}/{len(files)}: {file_path}")
-        print("-" * 40)
-        
-        try:
-            # Parse conversations from this file
-            conversations = converter.parse_chatgpt_export(file_path)
-            print(f"  ✅ Extracted {len(conversations)} conversations")
-            
-            # Add file source info
-            for conv in conversations:
-                conv['source_file'] = os.path.basename(file_path)
-            
-            all_conversations.extend(conversations)
-            
-        except Exception as e:
-            print(f"  ❌ Error processing {file_path}: {str(e)[:100]}")
-            continue
-    
-    print(f"\n📊 Total conversations collected: {len(all_conversations)}")
-    
-    if not all_conversations:
-        print("❌ No conversations extracted from any file")
-        return
-    
-    # Remove duplicates based on title and date
-    print("\n🔄 Removing duplicates...")
+    report = new_batch_report(files)
     seen = set()
-    unique_conversations = []
-    for conv in all_conversations:
-        key = (conv['name'], conv.get('date', ''))
-        if key not in seen:
-            seen.add(key)
-            unique_conversations.append(conv)
-    
-    print(f"  📝 Unique conversations: {len(unique_conversations)}")
-    print(f"  🗑️ Duplicates removed: {len(all_conversations) - len(unique_conversations)}")
+    near_dups = (NearDuplicateFilter(near_dup_threshold)
+                 if near_dup_threshold is not None else None)
+    total_collected = 0
+    near_dups_removed = 0
     
-    # Sort by date
-    print("\n📅 Sorting by date...")
-    unique_conversations.sort(key=lambda x: x.get('date', '9999-99-99'))
+    # Parse files in parallel - each one is independent and CPU-bound
+    print(f"\n📖 Processing {len(files)} files in parallel...")
+    print("-" * 40)
     
-    # Convert to CSV
-    print("\n💾 Converting to CSV format...")
-    output_files = converter.convert_to_csv(unique_conversations, "complete_archive")
+    with tempfile.TemporaryDirectory() as run_dir:
+        run_files = []
+        
+        # Queue readahead for all files at once so later files are already
+        # in the page cache by the time a worker gets to them
+        _prefetch(files)
+        
+        max_workers = min(len(files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            # At most 2 * max_workers files are parsed ahead, so finished
+            # results waiting behind a slow file can't pile up in memory
+            pending_files = iter(files)
+            futures = deque(ex.submit(_parse_one, p)
+                            for p in islice(pending_files, 2 * max_workers))
+            
+            # Consume results in input order so duplicates resolve the same
+            # way every run; later files keep parsing in the background.
+            # Futures are popped so a finished file's result isn't kept alive
+            for i, file_path in enumerate(files, 1):
+                future = futures.popleft()
+                next_file = next(pending_files, None)
+                if next_file is not None:
+                    futures.append(ex.submit(_parse_one, next_file))
+                try:
+                    # Parse conversations from this file
+                    conversations = future.result()
+                    del future
+                    print(f"  ✅ [{i}/{len(files)}] {file_path}: "
+                          f"extracted {len(conversations)} conversations")
+                    
+                except Exception as e:
+                    print(f"  ❌ Error processing {file_path}: {str(e)[:100]}")
+                    continue
+                
+                total_collected += len(conversations)
+                
+                if not conversations:
+                    continue
+                
+                # Remove duplicates based on title and date - pandas handles
+                # repeats within the file, the seen set repeats across files
+                df = pd.DataFrame(conversations)
+                df = df.drop_duplicates(subset=['name', 'date'], keep='first')
+                keys = list(map(dedup_key, df['name'], df['date']))
+                df = df[[key not in seen for key in keys]]
+                seen.update(keys)
+                
+                # Optionally drop conversations that are only near-identical
+                if near_dups is not None:
+                    keep = [not near_dups.is_duplicate(f"{name} {first_message}")
+                            for name, first_message in zip(df['name'], df['first_message'])]
+                    near_dups_removed += len(keep) - sum(keep)
+                    df = df[np.array(keep, dtype=bool)]  # a plain [] would select columns
+                
+                # Write this file's conversations as a date-sorted run
+                df = df.sort_values('date', kind='stable')
+                update_batch_report(report, df)
+                unique_conversations = df.to_dict('records')
+                
+                run_file = os.path.join(run_dir, f"run_{i:03d}.csv")
+                converter.write_csv(map(converter.format_csv_row, unique_conversations), run_file)
+                run_files.append(run_file)
+                
+                # This file is on disk now - release it before the next one
+                conversations.clear()
+                del conversations, df, unique_conversations
+                if i % GC_EVERY_FILES == 0:
+                    gc.collect()
+        
+        print(f"\n📊 Total conversations collected: {total_collected}")
+        
+        if not total_collected:
+            print("❌ No conversations extracted from any file")
+            return
+        
+        print(f"  📝 Unique conversations: {report['total_conversations']}")
+        print(f"  🗑️ Duplicates removed: {total_collected - len(seen)}")
+        if near_dups is not None:
+            print(f"  🧹 Near-duplicates removed: {near_dups_removed}")
+        
+        # Merge the sorted runs and convert to CSV
+        print("\n💾 Merging by date and converting to CSV format...")
+        output_files = _write_chunks(converter, _merge_runs(converter, run_files, run_dir),
+                                     "complete_archive", chunk_rows)
     
     # Create comprehensive report
     print("\n📊 Creating comprehensive report...")
-    create_batch_report(unique_conversations, files)
+    create_batch_report(report)
     
     print("\n✅ Batch processing complete!")
     print(f"📁 Created {len(output_files)} CSV files")
     print(f"📊 Report saved to complete_archive_report.json")
     
-    return unique_conversations
+    return output_files
 
-def create_batch_report(conversations, source_files):
-    """Create detailed report for batch processing"""
+def new_batch_report(source_files):
+    """Start an empty batch report, filled in by update_batch_report"""
     
-    report = {
+    return {
         'processing_date': datetime.now().strftime('%Y-%m-%d %H:%M'),
         'source_files': source_files,
-        'total_conversations': len(conversations),
+        'total_conversations': 0,
         'statistics': {
-            'by_source_file': {},
-            'by_date': {},
-            'by_category': {},
+            'by_source_file': Counter(),
+            'by_date': Counter(),
+            'by_category': Counter(),
             'by_relevance': {
                 'high': 0,
                 'medium': 0,
                 'low': 0
             },
-            'top_tags': {},
-            'top_projects': {}
+            'top_tags': Counter(),
+            'top_projects': Counter()
         }
     }
+
+def update_batch_report(report, df):
+    """Add one DataFrame of unique conversations to the report statistics"""
+    
+    report['total_conversations'] += len(df)
+    
+    stats = report['statistics']
+    by_category = stats['by_category']
+    by_relevance = stats['by_relevance']
+    tag_counts = stats['top_tags']  # trimmed to the top 20 in create_batch_report
+    project_counts = stats['top_projects']  # trimmed to the top 10
+    
+    # Count by source file and by month, column-wise
+    stats['by_source_file'].update(df['source_file'].value_counts(sort=False).to_dict())
+    dates = df['date']
+    months = dates[dates != ''].str[:7]  # YYYY-MM
+    stats['by_date'].update(months.value_counts(sort=False).to_dict())
+    
+    # Relevance distribution: bucket 0/1/2 = low/medium/high
+    scores = df['relevance_score'].to_numpy(dtype=float)
+    low, medium, high = np.bincount((scores >= 0.5).astype(np.intp) + (scores >= 0.8),
+                                    minlength=3)
+    by_relevance['high'] += int(high)
+    by_relevance['medium'] += int(medium)
+    by_relevance['low'] += int(low)
+    
+    # Category, project and tag distribution from the list columns
+    for categories, tags in zip(df['category'], df['tags']):
+        by_category.update(categories)
+        for cat in categories:
+            if 'Project' in cat:
+                project_counts[cat] += 1
+        tag_counts.update(tags)
+
+def create_batch_report(report):
+    """Create detailed report for batch processing"""
     
-    # Count by source file
-    for conv in conversations:
-        source = conv.get('source_file', 'unknown')
-        report['statistics']['by_source_file'][source] = \
-            report['statistics']['by_source_file'].get(source, 0) + 1
-    
-    # Count by month
-    for conv in conversations:
-        if conv.get('date'):
-            month = conv['date'][:7]  # YYYY-MM
-            report['statistics']['by_date'][month] = \
-                report['statistics']['by_date'].get(month, 0) + 1
-    
-    # Category distribution
-    for conv in conversations:
-        for cat in conv.get('category', []):
-            report['statistics']['by_category'][cat] = \
-                report['statistics']['by_category'].get(cat, 0) + 1
-    
-    # Relevance distribution
-    for conv in conversations:
-        score = conv.get('relevance_score', 0.5)
-        if score >= 0.8:
-            report['statistics']['by_relevance']['high'] += 1
-        elif score >= 0.5:
-            report['statistics']['by_relevance']['medium'] += 1
-        else:
-            report['statistics']['by_relevance']['low'] += 1
-    
-    # Top tags
-    all_tags = []
-    for conv in conversations:
-        all_tags.extend(conv.get('tags', []))
-    from collections import Counter
-    report['statistics']['top_tags'] = dict(Counter(all_tags).most_common(20))
+    stats = report['statistics']
+    for key in ('by_source_file', 'by_date', 'by_category'):
+        stats[key] = dict(stats[key])
     
-    # Top projects
-    project_cats = [cat for conv in conversations 
-                   for cat in conv.get('category', []) 
-                   if 'Project' in cat]
-    report['statistics']['top_projects'] = dict(Counter(project_cats).most_common(10))
+    # Keep only the most common tags and projects
+    stats['top_tags'] = dict(stats['top_tags'].most_common(20))
+    stats['top_projects'] = dict(stats['top_projects'].most_common(10))
     
     # Save report
-    with open('complete_archive_report.json', 'w') as f:
-        json.dump(report, f, indent=2)
+    with open('complete_archive_report.json', 'wb') as f:
+        f.write(json_dumps(report))
     
     # Print summary
     print("\n📈 Processing Summary:")
-    print(f"  Total Files: {len(source_files)}")
-    print(f"  Total Conversations: {len(conversations)}")
+    print(f"  Total Files: {len(report['source_files'])}")
+    print(f"  Total Conversations: {report['total_conversations']}")
     
     if report['statistics']['by_date']:
         dates = sorted(report['statistics']['by_date'].keys())
@@ -178,43 +421,111 @@ def create_batch_report(conversations, source_files):
     for tag, count in list(report['statistics']['top_tags'].items())[:5]:
         print(f"    - {tag}: {count}")
 
-def merge_csv_files(pattern="complete_archive_chunk_*.csv", output="final_merged.csv"):
-    """Merge all CSV chunks into one file (if needed for Gemini)"""
+def merge_csv_files(pattern="complete_archive_chunk_*.csv", output="final_merged.csv",
+                    validate=False, csv_files=None):
+    """Merge all CSV chunks into one file (if needed for Gemini)
+    
+    Pass csv_files (e.g. the list process_multiple_files returns) to merge
+    exactly those chunks; otherwise every file matching pattern is merged,
+    including chunks left over from earlier runs.
+    
+    Returns the merged file's path, or None if there was nothing to merge.
+    This used to be the merged DataFrame; use pd.read_csv(output) for one.
+    """
     
     print("\n🔀 Merging CSV files...")
-    csv_files = sorted(glob.glob(pattern))
+    if csv_files is None:
+        csv_files = sorted(glob.glob(pattern))
     
     if not csv_files:
         print("No CSV files to merge")
         return
     
+    if validate:
+        return _merge_csv_files_validated(csv_files, output)
+    
+    # Plain byte copy - keep the first header, skip the rest
+    header = None
+    merged_files = 0
+    with open(output, 'wb') as out:
+        for f in csv_files:
+            with open(f, 'rb') as inp:
+                file_header = inp.readline()
+                if header is None:
+                    header = file_header
+                    out.write(header)
+                elif file_header != header:
+                    print(f"  ⚠️ Skipping {f}: columns differ from {csv_files[0]}")
+                    continue
+                
+                shutil.copyfileobj(inp, out, length=1 << 20)
+                merged_files += 1
+    
+    print(f"  ✅ Merged {merged_files} files into {output}")
+    print(f"  📦 Size: {os.path.getsize(output) / 1024:.1f}KB")
+    
+    return output
+
+def _merge_csv_files_validated(csv_files, output):
+    """Merge CSV chunks through pandas, checking every chunk's schema"""
+    
     dfs = []
     for f in csv_files:
         df = pd.read_csv(f)
+        if dfs and list(df.columns) != list(dfs[0].columns):
+            print(f"  ⚠️ Skipping {f}: columns differ from {csv_files[0]}")
+            continue
         dfs.append(df)
     
     merged = pd.concat(dfs, ignore_index=True)
     merged.to_csv(output, index=False)
     
-    print(f"  ✅ Merged {len(csv_files)} files into {output}")
+    print(f"  ✅ Merged {len(dfs)} files into {output}")
     print(f"  📊 Total records: {len(merged)}")
     
-    return merged
+    return output
+
+def _positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must be a whole number, got {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def _similarity(value):
+    """argparse type for similarity thresholds in (0, 1]"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must be a number, got {value}")
+    if not 0 < number <= 1:
+        raise argparse.ArgumentTypeError(f"must be above 0 and at most 1, got {value}")
+    return number
 
 if __name__ == "__main__":
-    import argparse
     
     parser = argparse.ArgumentParser(description='Batch process conversation exports')
     parser.add_argument('pattern', nargs='?', default='conv_part_*.txt',
                        help='File pattern to match (default: conv_part_*.txt)')
     parser.add_argument('--merge', action='store_true',
                        help='Merge all CSV outputs into one file')
+    parser.add_argument('--chunk-rows', type=_positive_int, default=500, metavar='N',
+                       help='Records per output CSV chunk (default: 500)')
+    parser.add_argument('--near-dup-threshold', type=_similarity, default=None,
+                       metavar='T',
+                       help='Also drop near-duplicates with similarity >= T (e.g. 0.9)')
+    parser.add_argument('--validate', action='store_true',
+                       help='Check chunk schemas with pandas while merging')
     
     args = parser.parse_args()
     
     # Process all files
-    conversations = process_multiple_files(args.pattern)
+    output_files = process_multiple_files(args.pattern, args.near_dup_threshold,
+                                          args.chunk_rows)
     
     # Optionally merge CSVs
-    if args.merge and conversations:
-        merge_csv_files()
+    if args.merge and output_files:
+        merge_csv_files(validate=args.validate, csv_files=output_files)
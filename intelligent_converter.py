@@ -5,13 +5,111 @@ Handles ChatGPT and Claude exports -> Clean CSV for Gemini
 """
 
 import json
-import csv
-import pandas as pd
 import re
 from datetime import datetime
 import os
-from typing import Dict, List, Optional, Any
+import mmap
+from typing import Dict, Iterable, Iterator, List, Optional, Any
 import hashlib
+import heapq
+from collections import Counter
+from itertools import chain, islice
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Start of each conversation record in a raw text export
+_RECORD_START_RE = re.compile(r'"title":\s*"')
+_RECORD_START_BYTES_RE = re.compile(rb'"title":\s*"')
+
+# Fields inside a raw text record
+_TITLE_RE = re.compile(r'([^"]+)"')
+_CREATE_TIME_RE = re.compile(r'"create_time":\s*([\d.]+)')
+_UPDATE_TIME_RE = re.compile(r'"update_time":\s*([\d.]+)')
+_PARTS_RE = re.compile(r'"parts":\s*\["([^"]+)"')
+_VALUE_RE = re.compile(r'"value":\s*"([^"]+)"')
+_CONTENT_RE = re.compile(r'"content":\s*"([^"]+)"')
+
+# Key phrases
+_HOW_TO_RE = re.compile(r'how to ([^.!?]+)', re.IGNORECASE)
+_CREATE_BUILD_RE = re.compile(r'(?:create|build)\s+(?:a\s+)?([^.!?]+)', re.IGNORECASE)
+
+class _TitleCleanTable(dict):
+    """str.translate table dropping all but word characters, whitespace and -–—:,.()
+    
+    Filled in lazily, one code point at a time, since the set of word
+    characters spans all of Unicode.
+    """
+    keep = frozenset('_-–—:,.()')
+    
+    def __missing__(self, code):
+        ch = chr(code)
+        value = code if ch.isalnum() or ch.isspace() or ch in self.keep else None
+        self[code] = value
+        return value
+
+_TITLE_CLEAN_TABLE = _TitleCleanTable()
+
+# JSON string escapes left in text cut out of a raw export
+_JSON_ESCAPE_RE = re.compile(
+    r'\\u([dD][89abAB][0-9a-fA-F]{2})\\u([dD][c-fC-F][0-9a-fA-F]{2})'  # surrogate pair
+    r'|\\u([0-9a-fA-F]{4})'
+    r'|\\(["\\/bfnrt])'
+)
+_JSON_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f',
+                 'n': '\n', 'r': '\r', 't': '\t'}
+
+def _unescape_match(match) -> str:
+    high, low, code, char = match.groups()
+    if high:
+        return chr(0x10000 + ((int(high, 16) - 0xD800) << 10) + (int(low, 16) - 0xDC00))
+    if code:
+        return chr(int(code, 16))
+    return _JSON_ESCAPES[char]
+
+def json_unescape(text: str) -> str:
+    """Decode JSON string escapes, leaving any other text untouched"""
+    if '\\' not in text:
+        return text
+    return _JSON_ESCAPE_RE.sub(_unescape_match, text)
+
+# orjson parses and dumps much faster; fall back to the stdlib
+try:
+    import orjson
+    
+    def json_loads(content):
+        """Parse JSON from a str, bytes or memory-mapped file without copying it"""
+        if isinstance(content, (str, bytes, bytearray)):
+            return orjson.loads(content)
+        with memoryview(content) as view:
+            return orjson.loads(view)
+    
+    def json_dumps(obj) -> bytes:
+        """Serialize obj as indented UTF-8 JSON"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def json_loads(content):
+        """Parse JSON from a str, bytes or memory-mapped file"""
+        if not isinstance(content, (str, bytes, bytearray)):
+            content = bytes(content)  # json.loads can't read an mmap
+        return json.loads(content)
+    
+    def json_dumps(obj) -> bytes:
+        """Serialize obj as indented UTF-8 JSON"""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def dedup_key(*fields: str) -> bytes:
+    """Fixed 16-byte digest identifying a conversation by the given fields"""
+    return hashlib.blake2b('\0'.join(fields).encode(), digest_size=16).digest()
+
+def _csv_field(value: Any) -> str:
+    """Format one CSV field, quoting only when needed (like csv.QUOTE_MINIMAL)"""
+    if value is None:
+        return ''
+    value = str(value)
+    if ',' in value or '"' in value or '\n' in value or '\r' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
 
 class IntelligentConverter:
     def __init__(self):
@@ -144,39 +242,160 @@ class IntelligentConverter:
                          "analysis", "optimization", "testing", "implementation"]
         }
 
+        # Tags added on top of tag_patterns (keyword -> tag)
+        self.extra_tags = [
+            ('gtr', "GTR"), ('receipts', "GTR"), ('tnt', "TNT"),
+            ('paleohacks', "PaleoHacks"),
+            ('framework', "Framework"), ('template', "Template"),
+            ('automation', "Automation"), ('n8n', "Automation"),
+            ('analysis', "Analysis"), ('audit', "Analysis"),
+            ('email sequence', "Email Sequence"), ('landing page', "Landing Page"),
+            ('sales page', "Sales Page"), ('vsl', "VSL")
+        ]
+
+        # Fallback categories when no pattern scores (checked in order)
+        self.fallback_categories = [
+            ("Prompt Engineering", ['prompt', 'template', 'system']),
+            ("Copywriting - Emails", ['email', 'sequence', 'newsletter']),
+            ("Business Strategy", ['strategy', 'planning', 'framework']),
+            ("Customer Research", ['research', 'customer', 'avatar'])
+        ]
+
+        # Deliverables and tools named in descriptions
+        self.deliverable_patterns = {
+            'email sequence': ['email sequence'],
+            'landing page': ['landing page'],
+            'sales page': ['sales page'],
+            'VSL script': ['vsl script'],
+            'ad copy': ['ad copy'],
+            'headline': ['headline'],
+            'hook': ['hook'],
+            'framework': ['framework'],
+            'template': ['template']
+        }
+        self.tool_patterns = {
+            'Claude': ['claude'],
+            'ChatGPT': ['chatgpt', 'gpt'],
+            'n8n': ['n8n'],
+            'Cursor': ['cursor'],
+            'Zapier': ['zapier'],
+            'Airtable': ['airtable']
+        }
+
+        # Union of the keyword tables, each keyword once, so text is scanned
+        # a single time however many tables share a keyword
+        keywords = [p for patterns in self.category_patterns.values() for p in patterns]
+        keywords += [w for _, words in self.fallback_categories for w in words]
+        keywords += [p for patterns in self.tag_patterns.values() for p in patterns]
+        keywords += [kw for kw, _ in self.extra_tags]
+        self.content_keywords = tuple(dict.fromkeys(keywords))
+        keywords = [p for patterns in self.deliverable_patterns.values() for p in patterns]
+        keywords += [p for patterns in self.tool_patterns.values() for p in patterns]
+        self.description_keywords = tuple(dict.fromkeys(keywords))
+
+        # Labels that raise the relevance score
+        self.project_categories = frozenset(
+            cat for cat in [*self.categories, *self.category_patterns] if 'Project' in cat)
+        self.framework_tags = frozenset(['Framework', 'Template', 'System'])
+        self.deliverable_tags = frozenset(['Email Sequence', 'Landing Page', 'Sales Page'])
+
     def parse_chatgpt_export(self, file_path: str) -> List[Dict]:
         """Parse ChatGPT conversation export properly"""
-        conversations = []
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        return list(self.iter_chatgpt_export(file_path))
+    
+    def iter_chatgpt_export(self, file_path: str,
+                            workers: Optional[int] = None) -> Iterator[Dict]:
+        """Parse ChatGPT conversation export, yielding one conversation at a time
+        
+        With workers > 1, conversations are analyzed in a process pool.
+        """
+        with open(file_path, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                return  # mmap can't map an empty file
+            
+            # Map the file instead of copying it into a str; the raw text
+            # parser only decodes one record at a time
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, 'madvise'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                yield from self.iter_chatgpt_export_content(mm, workers)
+    
+    def iter_chatgpt_export_content(self, content,
+                                    workers: Optional[int] = None) -> Iterator[Dict]:
+        """Parse an in-memory export, yielding one conversation at a time"""
+        first = content[:1]
+        if not isinstance(first, str):
+            first = first.decode('latin-1')
         
         # Handle different export formats
-        if content.startswith('['):  # JSON array
-            data = json.loads(content)
-        elif content.startswith('{'):  # Single JSON object
-            data = [json.loads(content)]
-        else:  # Raw text export (your conv_part_aa.txt format)
-            data = self.parse_raw_text_export(content)
+        data = None
+        if first in ('[', '{'):
+            try:
+                data = json_loads(content)
+            except ValueError:
+                # Split exports (conv_part_aa.txt) start like JSON but are
+                # cut mid-record - fall through to the raw text parser
+                pass
+            else:
+                if isinstance(data, dict):  # Single JSON object
+                    data = [data]
+        
+        if data is None:  # Raw text export (your conv_part_aa.txt format)
+            data = self.iter_raw_text_export(content)
+        
+        if workers and workers > 1:
+            yield from self.extract_conversations_parallel(data, workers)
+            return
         
         for conv_data in data:
             parsed = self.extract_conversation_details(conv_data)
             if parsed:
-                conversations.append(parsed)
+                yield parsed
+    
+    def extract_conversations_parallel(self, records: Iterable[Dict], workers: int,
+                                       chunksize: int = 64) -> Iterator[Dict]:
+        """Run extract_conversation_details over records in a process pool
+        
+        Records are sent in batches so only a few are in flight at once;
+        results come back in input order.
+        """
+        records = iter(records)
+        batch_size = chunksize * workers * 2
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                for parsed in executor.map(_extract_details, batch, chunksize=chunksize):
+                    if parsed:
+                        yield parsed
+    
+    def parse_raw_text_export(self, content) -> List[Dict]:
+        """Parse the raw text export format like conv_part_aa.txt
         
-        return conversations
+        content can be a str, UTF-8 bytes or a memory-mapped file.
+        """
+        return list(self.iter_raw_text_export(content))
     
-    def parse_raw_text_export(self, content: str) -> List[Dict]:
-        """Parse the raw text export format like conv_part_aa.txt"""
-        conversations = []
+    def iter_raw_text_export(self, content) -> Iterator[Dict]:
+        """Parse a raw text export, yielding one record at a time"""
+        is_text = isinstance(content, str)
+        record_start = _RECORD_START_RE if is_text else _RECORD_START_BYTES_RE
         
-        # Split by conversation boundaries
-        conv_splits = re.split(r'"title":\s*"', content)
+        # Find conversation boundaries in one scan; each record runs from the
+        # end of its "title": marker to the start of the next one
+        bounds = [(m.start(), m.end()) for m in record_start.finditer(content)]
+        bounds.append((len(content), len(content)))
         
-        for i, conv_text in enumerate(conv_splits[1:], 1):  # Skip first empty split
+        for i in range(1, len(bounds)):
             try:
+                conv_text = content[bounds[i - 1][1]:bounds[i][0]]
+                if not is_text:
+                    conv_text = conv_text.decode('utf-8')
+                
                 # Extract title
-                title_match = re.match(r'([^"]+)"', conv_text)
+                title_match = _TITLE_RE.match(conv_text)
                 if not title_match:
                     continue
                 
@@ -186,29 +405,27 @@ class IntelligentConverter:
                 create_time = None
                 update_time = None
                 
-                create_match = re.search(r'"create_time":\s*([\d.]+)', conv_text)
+                create_match = _CREATE_TIME_RE.search(conv_text)
                 if create_match:
                     create_time = float(create_match.group(1))
                 
-                update_match = re.search(r'"update_time":\s*([\d.]+)', conv_text)
+                update_match = _UPDATE_TIME_RE.search(conv_text)
                 if update_match:
                     update_time = float(update_match.group(1))
                 
                 # Extract actual message content (not metadata)
                 messages = self.extract_messages_from_raw(conv_text)
                 
-                conversations.append({
+                record = {
                     'title': title,
                     'create_time': create_time,
                     'update_time': update_time,
-                    'messages': messages,
-                    'raw_text': conv_text[:5000]  # Keep some raw for fallback
-                })
+                    'messages': messages
+                }
             except Exception as e:
                 print(f"Error parsing conversation {i}: {e}")
                 continue
-        
-        return conversations
+            yield record
     
     def extract_messages_from_raw(self, conv_text: str) -> List[str]:
         """Extract actual message content from the conversation"""
@@ -216,28 +433,49 @@ class IntelligentConverter:
         
         # Look for actual message content patterns
         # Pattern 1: "content": {"parts": ["actual message here"]}
-        content_matches = re.findall(r'"parts":\s*\["([^"]+)"', conv_text)
+        content_matches = _PARTS_RE.findall(conv_text)
         messages.extend(content_matches)
         
         # Pattern 2: "text": {"value": "message content"}
-        text_matches = re.findall(r'"value":\s*"([^"]+)"', conv_text)
+        text_matches = _VALUE_RE.findall(conv_text)
         messages.extend(text_matches)
         
         # Pattern 3: "message": {"content": "..."}
-        msg_matches = re.findall(r'"content":\s*"([^"]+)"', conv_text)
+        msg_matches = _CONTENT_RE.findall(conv_text)
         messages.extend(msg_matches)
         
         # Clean and filter messages
         cleaned_messages = []
         for msg in messages:
             # Unescape unicode
-            msg = msg.encode().decode('unicode_escape')
+            msg = json_unescape(msg)
             # Remove system messages and empty content
             if len(msg) > 20 and not msg.startswith('You are'):
                 cleaned_messages.append(msg)
         
         return cleaned_messages
     
+    def extract_messages_from_mapping(self, mapping: Dict) -> List[str]:
+        """Extract message content from a parsed JSON export's mapping tree"""
+        messages = []
+        
+        for node in mapping.values():
+            message = (node or {}).get('message') or {}
+            content = message.get('content') or {}
+            
+            # "content": {"parts": ["actual message here"]} or "content": "..."
+            if isinstance(content, str):
+                texts = [content]
+            else:
+                texts = [part for part in content.get('parts') or [] if isinstance(part, str)]
+            
+            # Remove system messages and empty content
+            for msg in texts:
+                if len(msg) > 20 and not msg.startswith('You are'):
+                    messages.append(msg)
+        
+        return messages
+    
     def extract_conversation_details(self, conv_data: Dict) -> Optional[Dict]:
         """Extract meaningful details from conversation data"""
         
@@ -259,22 +497,27 @@ class IntelligentConverter:
                     date_obj = datetime.fromtimestamp(create_time)
                     date_str = date_obj.strftime('%Y-%m-%d')
                     date_source = 'exact'
-            except:
-                pass
+            except (OverflowError, OSError, ValueError):
+                pass  # Out of range for the platform's time functions
         
-        # Extract messages for content analysis
-        messages = conv_data.get('messages', [])
-        if not messages and 'raw_text' in conv_data:
-            messages = self.extract_messages_from_raw(conv_data['raw_text'])
+        # Extract messages for content analysis - JSON exports carry them in
+        # the mapping tree, already unescaped by the JSON parser
+        messages = conv_data.get('messages')
+        if messages is None and isinstance(conv_data.get('mapping'), dict):
+            messages = self.extract_messages_from_mapping(conv_data['mapping'])
+        messages = messages or []
         
         # Create intelligent description
         description = self.create_intelligent_description(title, messages)
         
+        # Match category and tag keywords in one pass
+        category_hits, tag_hits = self.match_keywords(title, description, messages)
+        
         # Determine categories
-        categories = self.determine_categories(title, description, messages)
+        categories = self.determine_categories(title, description, messages, category_hits)
         
         # Generate specific tags
-        tags = self.generate_specific_tags(title, description, messages)
+        tags = self.generate_specific_tags(title, description, messages, tag_hits)
         
         # Calculate relevance score
         relevance_score = self.calculate_relevance_score(
@@ -295,7 +538,8 @@ class IntelligentConverter:
             'message_volume': message_volume,
             'creator': 'Piet Weinman',
             'type': 'chatgpt',
-            'url': f"https://chat.openai.com/c/{self.generate_id(title)}"
+            'url': f"https://chat.openai.com/c/{self.generate_id(title)}",
+            'first_message': messages[0][:200] if messages else ''  # not written to CSV
         }
     
     def create_intelligent_description(self, title: str, messages: List[str]) -> str:
@@ -333,12 +577,13 @@ class IntelligentConverter:
                 description_parts.append(f"Discussion of {', '.join(key_phrases[:3])}")
         
         # Add specific deliverables if found
-        deliverables = self.extract_deliverables(content)
+        hits = self.match_description_keywords(content)
+        deliverables = self.extract_deliverables(content, hits)
         if deliverables:
             description_parts.append(f"Created: {', '.join(deliverables)}")
         
         # Add tools/techniques if found
-        tools = self.extract_tools(content)
+        tools = self.extract_tools(content, hits)
         if tools:
             description_parts.append(f"Using: {', '.join(tools)}")
         
@@ -355,12 +600,38 @@ class IntelligentConverter:
         
         return description[:300]  # Limit to 300 chars
     
+    def match_keywords(self, title: str, description: str,
+                       messages: List[str]) -> tuple:
+        """Scan conversation text once for every category and tag keyword
+        
+        Returns (category_hits, tag_hits). Categories look at the title,
+        description and first five messages; tags at the first three only,
+        which is a prefix of the same text.
+        """
+        content = f"{title} {description} {' '.join(messages[:3])}".lower()
+        tag_end = len(content)
+        if len(messages) > 3:
+            content += f" {' '.join(messages[3:5])}".lower()
+        
+        category_hits = set()
+        tag_hits = set()
+        for keyword in self.content_keywords:
+            pos = content.find(keyword)
+            if pos >= 0:
+                category_hits.add(keyword)
+                if pos + len(keyword) <= tag_end:
+                    tag_hits.add(keyword)
+        
+        return category_hits, tag_hits
+    
     def determine_categories(self, title: str, description: str, 
-                            messages: List[str]) -> List[str]:
+                            messages: List[str],
+                            hits: Optional[set] = None) -> List[str]:
         """Intelligently determine categories"""
         
         categories = []
-        content = f"{title} {description} {' '.join(messages[:5])}".lower()
+        if hits is None:
+            hits = self.match_keywords(title, description, messages)[0]
         
         # Score each category
         category_scores = {}
@@ -368,73 +639,47 @@ class IntelligentConverter:
         for category, patterns in self.category_patterns.items():
             score = 0
             for pattern in patterns:
-                if pattern in content:
+                if pattern in hits:
                     score += 1
             if score > 0:
                 category_scores[category] = score
         
         # Get top categories (multi-category assignment)
         if category_scores:
-            sorted_categories = sorted(category_scores.items(), 
-                                     key=lambda x: x[1], reverse=True)
-            categories = [cat[0] for cat in sorted_categories[:3]]
+            top_categories = heapq.nlargest(3, category_scores.items(), key=itemgetter(1))
+            categories = [cat[0] for cat in top_categories]
         
         # Fallback to general category detection
         if not categories:
-            if any(word in content for word in ['prompt', 'template', 'system']):
-                categories.append("Prompt Engineering")
-            elif any(word in content for word in ['email', 'sequence', 'newsletter']):
-                categories.append("Copywriting - Emails")
-            elif any(word in content for word in ['strategy', 'planning', 'framework']):
-                categories.append("Business Strategy")
-            elif any(word in content for word in ['research', 'customer', 'avatar']):
-                categories.append("Customer Research")
+            for category, words in self.fallback_categories:
+                if any(word in hits for word in words):
+                    categories.append(category)
+                    break
             else:
                 categories.append("General Chat")
         
         return categories
     
     def generate_specific_tags(self, title: str, description: str, 
-                              messages: List[str]) -> List[str]:
+                              messages: List[str],
+                              hits: Optional[set] = None) -> List[str]:
         """Generate specific, useful tags"""
         
         tags = set()
-        content = f"{title} {description} {' '.join(messages[:3])}".lower()
+        if hits is None:
+            hits = self.match_keywords(title, description, messages)[1]
         
         # Check each tag category
         for category, patterns in self.tag_patterns.items():
             for pattern in patterns:
-                if pattern in content:
+                if pattern in hits:
                     # Add the actual term found, not the category
                     tags.add(pattern.title())
         
-        # Add specific project indicators
-        if 'gtr' in content or 'receipts' in content:
-            tags.add("GTR")
-        if 'tnt' in content:
-            tags.add("TNT")
-        if 'paleohacks' in content:
-            tags.add("PaleoHacks")
-        
-        # Add work type indicators
-        if 'framework' in content:
-            tags.add("Framework")
-        if 'template' in content:
-            tags.add("Template")
-        if 'automation' in content or 'n8n' in content:
-            tags.add("Automation")
-        if 'analysis' in content or 'audit' in content:
-            tags.add("Analysis")
-        
-        # Add deliverable types
-        if 'email sequence' in content:
-            tags.add("Email Sequence")
-        if 'landing page' in content:
-            tags.add("Landing Page")
-        if 'sales page' in content:
-            tags.add("Sales Page")
-        if 'vsl' in content:
-            tags.add("VSL")
+        # Add project, work type and deliverable indicators
+        for keyword, tag in self.extra_tags:
+            if keyword in hits:
+                tags.add(tag)
         
         # Limit to 5 most relevant tags
         return list(tags)[:5] if tags else ["General"]
@@ -447,15 +692,15 @@ class IntelligentConverter:
         score = 0.5  # Base score
         
         # Boost for project work
-        if any('Project' in cat for cat in categories):
+        if not self.project_categories.isdisjoint(categories):
             score += 0.2
         
         # Boost for frameworks/templates
-        if any(tag in tags for tag in ['Framework', 'Template', 'System']):
+        if not self.framework_tags.isdisjoint(tags):
             score += 0.15
         
         # Boost for specific deliverables
-        if any(tag in tags for tag in ['Email Sequence', 'Landing Page', 'Sales Page']):
+        if not self.deliverable_tags.isdisjoint(tags):
             score += 0.15
         
         # Boost for substantial conversations
@@ -476,41 +721,35 @@ class IntelligentConverter:
         
         return min(max(score, 0.1), 1.0)  # Keep between 0.1 and 1.0
     
-    def extract_deliverables(self, text: str) -> List[str]:
+    def match_description_keywords(self, text: str) -> set:
+        """Scan text once for every deliverable and tool keyword
+        
+        Whitespace runs are collapsed first, so "landing\npage" still
+        matches "landing page".
+        """
+        text = ' '.join(text.lower().split())
+        return {keyword for keyword in self.description_keywords if keyword in text}
+    
+    def extract_deliverables(self, text: str, hits: Optional[set] = None) -> List[str]:
         """Extract specific deliverables mentioned"""
+        if hits is None:
+            hits = self.match_description_keywords(text)
         deliverables = []
-        patterns = {
-            'email sequence': r'email\s+sequence',
-            'landing page': r'landing\s+page',
-            'sales page': r'sales\s+page',
-            'VSL script': r'vsl\s+script',
-            'ad copy': r'ad\s+copy',
-            'headline': r'headline',
-            'hook': r'hook',
-            'framework': r'framework',
-            'template': r'template'
-        }
         
-        for name, pattern in patterns.items():
-            if re.search(pattern, text, re.IGNORECASE):
+        for name, patterns in self.deliverable_patterns.items():
+            if any(pattern in hits for pattern in patterns):
                 deliverables.append(name)
         
         return deliverables[:3]  # Max 3 deliverables
     
-    def extract_tools(self, text: str) -> List[str]:
+    def extract_tools(self, text: str, hits: Optional[set] = None) -> List[str]:
         """Extract tools and platforms mentioned"""
+        if hits is None:
+            hits = self.match_description_keywords(text)
         tools = []
-        tool_patterns = {
-            'Claude': r'claude',
-            'ChatGPT': r'chatgpt|gpt',
-            'n8n': r'n8n',
-            'Cursor': r'cursor',
-            'Zapier': r'zapier',
-            'Airtable': r'airtable'
-        }
         
-        for name, pattern in tool_patterns.items():
-            if re.search(pattern, text, re.IGNORECASE):
+        for name, patterns in self.tool_patterns.items():
+            if any(pattern in hits for pattern in patterns):
                 tools.append(name)
         
         return tools[:3]  # Max 3 tools
@@ -522,13 +761,14 @@ class IntelligentConverter:
         # Simple key phrase extraction
         for msg in messages[:3]:  # Check first 3 messages
             # Look for phrases that indicate main topics
-            if 'how to' in msg.lower():
-                match = re.search(r'how to ([^.!?]+)', msg, re.IGNORECASE)
+            msg_lower = msg.lower()
+            if 'how to' in msg_lower:
+                match = _HOW_TO_RE.search(msg)
                 if match:
                     key_phrases.append(match.group(1)[:30])
             
-            if 'create' in msg.lower() or 'build' in msg.lower():
-                match = re.search(r'(?:create|build)\s+(?:a\s+)?([^.!?]+)', msg, re.IGNORECASE)
+            if 'create' in msg_lower or 'build' in msg_lower:
+                match = _CREATE_BUILD_RE.search(msg)
                 if match:
                     key_phrases.append(match.group(1)[:30])
         
@@ -537,9 +777,9 @@ class IntelligentConverter:
     def clean_title(self, title: str) -> str:
         """Clean and format title"""
         # Unescape unicode characters
-        title = title.encode().decode('unicode_escape')
+        title = json_unescape(title)
         # Remove special characters but keep important ones
-        title = re.sub(r'[^\w\s\-–—:,.\(\)]', '', title)
+        title = title.translate(_TITLE_CLEAN_TABLE)
         # Truncate if too long
         return title[:100]
     
@@ -547,58 +787,76 @@ class IntelligentConverter:
         """Generate a consistent ID from title"""
         return hashlib.md5(title.encode()).hexdigest()[:12]
     
-    def convert_to_csv(self, conversations: List[Dict], output_path: str, 
-                      chunk_size: int = 500) -> List[str]:
-        """Convert to CSV format optimized for Gemini"""
+    def format_csv_row(self, conv: Dict) -> Dict:
+        """Flatten a parsed conversation into a CSV row"""
+        return {
+            'name': conv['name'],
+            'description': conv['description'],
+            'category': '|'.join(conv['category']) if isinstance(conv['category'], list) else conv['category'],
+            'tags': ','.join(conv['tags']) if isinstance(conv['tags'], list) else conv['tags'],
+            'date': conv['date'],
+            'date_source': conv['date_source'],
+            'relevance_score': round(conv['relevance_score'], 2),
+            'message_volume': conv['message_volume'],
+            'creator': conv['creator'],
+            'type': conv['type'],
+            'url': conv['url']
+        }
+    
+    def convert_to_csv(self, conversations: Iterable[Dict], output_path: str, 
+                      chunk_size: int = 500,
+                      report: Optional[Dict] = None) -> List[str]:
+        """Convert to CSV format optimized for Gemini
         
-        output_files = []
+        conversations may be a generator; only one chunk is held at a time.
+        If report is given it is updated with every chunk written.
+        """
         
-        for i in range(0, len(conversations), chunk_size):
-            chunk = conversations[i:i+chunk_size]
-            
-            # Prepare for CSV
-            csv_data = []
-            for conv in chunk:
-                csv_data.append({
-                    'name': conv['name'],
-                    'description': conv['description'],
-                    'category': '|'.join(conv['category']) if isinstance(conv['category'], list) else conv['category'],
-                    'tags': ','.join(conv['tags']) if isinstance(conv['tags'], list) else conv['tags'],
-                    'date': conv['date'],
-                    'date_source': conv['date_source'],
-                    'relevance_score': round(conv['relevance_score'], 2),
-                    'message_volume': conv['message_volume'],
-                    'creator': conv['creator'],
-                    'type': conv['type'],
-                    'url': conv['url']
-                })
-            
-            # Create DataFrame and save
-            df = pd.DataFrame(csv_data)
+        output_files = []
+        conversations = iter(conversations)
+        chunk_num = 0
+        
+        while True:
+            chunk = list(islice(conversations, chunk_size))
+            if not chunk:
+                break
+            if report is not None:
+                self.update_summary_report(report, chunk)
             
             # Generate filename
-            chunk_num = (i // chunk_size) + 1
+            chunk_num += 1
             filename = f"{output_path}_chunk_{chunk_num:03d}.csv"
             
-            # Save with proper quoting
-            df.to_csv(filename, index=False, quoting=csv.QUOTE_MINIMAL)
+            # Format each row as it is written rather than listing them first
+            count = self.write_csv(map(self.format_csv_row, chunk), filename)
             output_files.append(filename)
             
-            print(f"✅ Created {filename}: {len(chunk)} records, {os.path.getsize(filename)/1024:.1f}KB")
+            print(f"✅ Created {filename}: {count} records, {os.path.getsize(filename)/1024:.1f}KB")
         
         return output_files
     
-    def create_summary_report(self, conversations: List[Dict], output_path: str):
-        """Create a summary report of the conversion"""
-        
-        report = {
-            'total_conversations': len(conversations),
-            'date_range': {
-                'earliest': min([c['date'] for c in conversations if c['date']]),
-                'latest': max([c['date'] for c in conversations if c['date']])
-            },
-            'categories_distribution': {},
-            'top_tags': {},
+    def write_csv(self, rows: Iterable[Dict], filename: str) -> int:
+        """Write CSV rows through one large buffer, returning the row count"""
+        
+        count = 0
+        with open(filename, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+            write = f.write
+            for row in rows:
+                if not count:
+                    write(','.join(map(_csv_field, row)) + '\n')
+                write(','.join(map(_csv_field, row.values())) + '\n')
+                count += 1
+        
+        return count
+    
+    def new_summary_report(self) -> Dict:
+        """Start an empty summary report to be filled chunk by chunk"""
+        return {
+            'total_conversations': 0,
+            'earliest': None,
+            'latest': None,
+            'categories_distribution': Counter(),
+            'top_tags': Counter(),
             'relevance_distribution': {
                 'high (0.8-1.0)': 0,
                 'medium (0.5-0.7)': 0,
@@ -606,35 +864,63 @@ class IntelligentConverter:
             },
             'missing_dates': 0
         }
+    
+    def update_summary_report(self, report: Dict, conversations: List[Dict]):
+        """Add a chunk of parsed conversations to a summary report"""
         
-        # Analyze categories
-        for conv in conversations:
-            for cat in conv['category']:
-                report['categories_distribution'][cat] = report['categories_distribution'].get(cat, 0) + 1
-        
-        # Analyze tags
-        all_tags = []
-        for conv in conversations:
-            all_tags.extend(conv['tags'])
-        from collections import Counter
-        report['top_tags'] = dict(Counter(all_tags).most_common(20))
-        
-        # Analyze relevance
-        for conv in conversations:
-            score = conv['relevance_score']
-            if score >= 0.8:
-                report['relevance_distribution']['high (0.8-1.0)'] += 1
-            elif score >= 0.5:
-                report['relevance_distribution']['medium (0.5-0.7)'] += 1
-            else:
-                report['relevance_distribution']['low (0.0-0.4)'] += 1
+        report['total_conversations'] += len(conversations)
+        
+        # Date range
+        dates = [c['date'] for c in conversations if c['date']]
+        if dates:
+            earliest, latest = min(dates), max(dates)
+            if report['earliest'] is None or earliest < report['earliest']:
+                report['earliest'] = earliest
+            if report['latest'] is None or latest > report['latest']:
+                report['latest'] = latest
         
         # Count missing dates
-        report['missing_dates'] = sum(1 for c in conversations if not c['date'])
+        report['missing_dates'] += len(conversations) - len(dates)
+        
+        # Analyze categories and tags
+        report['categories_distribution'].update(
+            chain.from_iterable(c['category'] for c in conversations))
+        report['top_tags'].update(chain.from_iterable(c['tags'] for c in conversations))
+        
+        # Analyze relevance: bucket 0/1/2 = low/medium/high
+        scores = np.fromiter((c['relevance_score'] for c in conversations),
+                             dtype=float, count=len(conversations))
+        low, medium, high = np.bincount((scores >= 0.5).astype(np.intp) + (scores >= 0.8),
+                                        minlength=3)
+        relevance = report['relevance_distribution']
+        relevance['high (0.8-1.0)'] += int(high)
+        relevance['medium (0.5-0.7)'] += int(medium)
+        relevance['low (0.0-0.4)'] += int(low)
+    
+    def create_summary_report(self, conversations: List[Dict], output_path: str):
+        """Create a summary report of the conversion"""
+        report = self.new_summary_report()
+        self.update_summary_report(report, conversations)
+        self.write_summary_report(report, output_path)
+    
+    def write_summary_report(self, summary: Dict, output_path: str):
+        """Save and print a summary report built with update_summary_report"""
+        
+        report = {
+            'total_conversations': summary['total_conversations'],
+            'date_range': {
+                'earliest': summary['earliest'],
+                'latest': summary['latest']
+            },
+            'categories_distribution': dict(summary['categories_distribution']),
+            'top_tags': dict(summary['top_tags'].most_common(20)),
+            'relevance_distribution': summary['relevance_distribution'],
+            'missing_dates': summary['missing_dates']
+        }
         
         # Save report
-        with open(f"{output_path}_report.json", 'w') as f:
-            json.dump(report, f, indent=2)
+        with open(f"{output_path}_report.json", 'wb') as f:
+            f.write(json_dumps(report))
         
         print("\n📊 Conversion Report:")
         print(f"Total Conversations: {report['total_conversations']}")
@@ -648,6 +934,17 @@ class IntelligentConverter:
         for tag, count in list(report['top_tags'].items())[:5]:
             print(f"  - {tag}: {count}")
 
+# Process pool workers keep one converter each, so the pattern tables are
+# built once per worker rather than once per conversation
+_worker_converter = None
+
+def _init_worker():
+    global _worker_converter
+    _worker_converter = IntelligentConverter()
+
+def _extract_details(conv_data: Dict) -> Optional[Dict]:
+    return _worker_converter.extract_conversation_details(conv_data)
+
 def main():
     """Main conversion function"""
     import sys
@@ -664,20 +961,20 @@ def main():
     
     converter = IntelligentConverter()
     
-    # Parse the input file
+    # Parse the input file lazily, so only one chunk is in memory at a time
     if 'gpt' in input_file.lower() or 'chatgpt' in input_file.lower():
-        conversations = converter.parse_chatgpt_export(input_file)
+        conversations = converter.iter_chatgpt_export(input_file, os.cpu_count())
     else:
         print("Note: Assuming ChatGPT format. For Claude exports, add 'claude' to filename.")
-        conversations = converter.parse_chatgpt_export(input_file)
-    
-    print(f"📚 Parsed {len(conversations)} conversations")
+        conversations = converter.iter_chatgpt_export(input_file, os.cpu_count())
     
-    # Convert to CSV
-    csv_files = converter.convert_to_csv(conversations, output_prefix)
+    # Convert to CSV, building the summary report as chunks are written
+    report = converter.new_summary_report()
+    csv_files = converter.convert_to_csv(conversations, output_prefix, report=report)
+    print(f"📚 Parsed {report['total_conversations']} conversations")
     
-    # Create summary report
-    converter.create_summary_report(conversations, output_prefix)
+    # Save summary report
+    converter.write_summary_report(report, output_prefix)
     
     print(f"\n✨ Conversion complete!")
     print(f"📁 Created {len(csv_files)} CSV files")
@@ -4,131 +4,354 @@ Quick Converter for Testing
 Handles the specific parsing issues with conv_part_aa.txt
 """
 
-import json
 import csv
+import mmap
 import re
 from datetime import datetime
-import pandas as pd
+from collections import Counter
+from functools import lru_cache
+from itertools import count, islice, repeat, starmap
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sys
 
-def quick_parse_conversations(file_path):
-    """Quick parse for testing with your conv_part_aa.txt format"""
+sys.path.append(os.path.dirname(__file__))
+from intelligent_converter import dedup_key, json_loads, json_unescape
+
+# Raw text export patterns, compiled once. They run on the undecoded file
+# so only the fields actually read are decoded
+_TITLE_SPLIT_RE = re.compile(rb'"title":\s*"')
+_CREATE_TIME_RE = re.compile(rb'"create_time":\s*([\d.]+)')
+_PARTS_RE = re.compile(rb'"parts":\s*\[\s*"([^"]+)"')
+_CONTENT_RE = re.compile(rb'"content":\s*"([^"]+)"')
+
+# Output columns, in CSV order
+CSV_COLUMNS = ['name', 'description', 'category', 'tags', 'date', 'date_source',
+               'relevance_score', 'message_volume', 'creator', 'type', 'url']
+
+# Messages kept per conversation for its description; the rest are only counted
+MESSAGE_SAMPLE = 3
+
+# Categories that earn the work type relevance boost
+_WORK_TYPE_CATEGORIES = frozenset(["Prompt Engineering", "Business Strategy",
+                                   "Copywriting - Emails", "AI Bot Configurations"])
+
+# Every keyword the description, category and tag rules look for, so each
+# text is scanned once per keyword however many rules share it
+_KEYWORDS = (
+    'valentina', 'sage', 'gtr', 'emma', 'tnt', 'resume', 'portfolio', 'job',
+    'email', 'sequence', 'campaign', 'prompt', 'ai', 'bot', 'assistant',
+    'strategy', 'framework', 'research', 'automation',
+    'claude', 'gpt', 'chatgpt', 'n8n'
+)
+
+def quick_parse_conversations(file_path, workers=None, report=None):
+    """Quick parse for testing with your conv_part_aa.txt format
+    
+    If report (from new_quick_report) is given, it is updated with every
+    conversation as it is parsed.
+    """
     
     print(f"📖 Reading {file_path}...")
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with open(file_path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return quick_parse_content(b'', workers, report)  # mmap can't map an empty file
+        
+        # Map the file instead of copying it into memory; records are sliced
+        # out of the mapping one at a time
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            return quick_parse_content(mm, workers, report)
+
+def quick_parse_content(content, workers=None, report=None):
+    """Parse an export held in bytes or a memory-mapped file"""
     
     conversations = []
     
-    # Split by "title": pattern
-    parts = re.split(r'"title":\s*"', content)[1:]  # Skip first empty part
-    
-    print(f"🔍 Found {len(parts)} potential conversations")
+    # Complete JSON exports are walked directly; split files like
+    # conv_part_aa.txt are cut mid-record and need the regex fallback
+    records = load_json_export(content)
+    if records is not None:
+        total = len(records)
+        read_fields = json_conversation_fields
+    else:
+        # Split by "title": pattern, one record at a time
+        total, records = split_raw_records(content)
+        read_fields = raw_conversation_fields
+    
+    print(f"🔍 Found {total} potential conversations")
+    
+    # Analyze records in a process pool when there is more than one CPU;
+    # repeated conversations are dropped before any enrichment work
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1:
+        results = build_conversations_parallel(read_fields, records, workers)
+    else:
+        fields = map(read_record, repeat(read_fields), count(), records)
+        results = starmap(build_conversation, unique_fields(fields))
     
-    for i, part in enumerate(parts):
-        try:
-            # Extract title (everything up to next quote)
-            title_end = part.find('"')
-            if title_end == -1:
-                continue
-            title = part[:title_end]
-            
-            # Skip empty or default titles
-            if not title or title == "New conversation":
-                continue
-            
-            # Clean the title
-            title = title.encode().decode('unicode_escape')
-            title = title.replace('\\/', '/').replace('\\"', '"')
-            
-            # Extract create_time
-            date_str = ""
-            date_source = "missing"
-            
-            create_match = re.search(r'"create_time":\s*([\d.]+)', part)
-            if create_match:
-                timestamp = float(create_match.group(1))
-                date_obj = datetime.fromtimestamp(timestamp)
-                date_str = date_obj.strftime('%Y-%m-%d')
-                date_source = "exact"
-            
-            # Extract actual conversation content (not metadata!)
-            # Look for message content patterns
-            messages = []
-            
-            # Pattern 1: "parts": ["content here"]
-            parts_matches = re.findall(r'"parts":\s*\[\s*"([^"]+)"', part)
-            for match in parts_matches:
-                clean_msg = match.encode().decode('unicode_escape')
-                if len(clean_msg) > 30 and not clean_msg.startswith('You are'):
-                    messages.append(clean_msg[:200])  # Limit each message
-            
-            # Pattern 2: "content": "message here"
-            if not messages:
-                content_matches = re.findall(r'"content":\s*"([^"]+)"', part)
-                for match in content_matches:
-                    clean_msg = match.encode().decode('unicode_escape')
-                    if len(clean_msg) > 30:
-                        messages.append(clean_msg[:200])
-            
-            # Create description from ACTUAL CONTENT, not metadata
-            description = create_smart_description(title, messages)
-            
-            # Determine category
-            categories = determine_category(title, description)
-            
-            # Generate tags
-            tags = generate_tags(title, description)
-            
-            # Calculate relevance
-            relevance = calculate_relevance(title, categories, len(messages))
-            
-            conversations.append({
-                'name': title[:100],  # Limit title length
-                'description': description,
-                'category': categories,
-                'tags': tags,
-                'date': date_str,
-                'date_source': date_source,
-                'relevance_score': relevance,
-                'message_volume': len(messages),
-                'creator': 'Piet Weinman',
-                'type': 'chatgpt',
-                'url': f"https://chat.openai.com/c/{i:06d}"
-            })
-            
-            if (i + 1) % 50 == 0:
-                print(f"  Processed {i + 1} conversations...")
-                
-        except Exception as e:
-            print(f"  ⚠️ Error processing conversation {i}: {str(e)[:50]}")
+    for i, conv in enumerate(results):
+        if conv is None:
             continue
+        conversations.append(conv)
+        if report is not None:
+            update_quick_report(report, conv)
+        
+        if (i + 1) % 50 == 0:
+            print(f"  Processed {i + 1} conversations...")
     
     print(f"✅ Successfully parsed {len(conversations)} conversations")
     return conversations
 
+def read_record(read_fields, i, record):
+    """Read export record i's fields, or None if it has none or can't be read"""
+    try:
+        return read_fields(record)
+    except Exception as e:
+        print(f"  ⚠️ Error processing conversation {i}: {str(e)[:50]}")
+        return None
+
+def unique_fields(fields_per_record):
+    """Skip unreadable records and conversations already seen
+    
+    Split exports repeat conversations across parts, so a record whose
+    title and first message match an earlier one is dropped. Yields
+    (record index, (title, create_time, messages, message_count)) pairs.
+    """
+    seen = set()
+    for i, fields in enumerate(fields_per_record):
+        if fields is None:
+            continue
+        
+        title, _, messages, _ = fields
+        key = dedup_key(title, messages[0] if messages else '')
+        if key in seen:
+            continue
+        seen.add(key)
+        yield i, fields
+
+def build_conversation(i, fields):
+    """Turn the fields of export record i into a conversation row, or None to skip it"""
+    
+    try:
+        title, timestamp, messages, message_count = fields
+        
+        # Skip empty or default titles
+        if not title or title == "New conversation":
+            return None
+        
+        # Convert create_time
+        date_str = ""
+        date_source = "missing"
+        
+        if timestamp is not None:
+            date_obj = datetime.fromtimestamp(timestamp)
+            date_str = date_obj.strftime('%Y-%m-%d')
+            date_source = "exact"
+        
+        # Create description from ACTUAL CONTENT, not metadata
+        description = create_smart_description(title, messages)
+        
+        # Categories and tags share one keyword scan
+        hits = match_keywords(f"{title} {description}")
+        
+        # Determine category
+        categories = determine_category(title, description, hits)
+        
+        # Generate tags
+        tags = generate_tags(title, description, hits)
+        
+        # Calculate relevance
+        relevance = calculate_relevance(title, categories, message_count)
+        
+        return {
+            'name': title[:100],  # Limit title length
+            'description': description,
+            'category': categories,
+            'tags': tags,
+            'date': date_str,
+            'date_source': date_source,
+            'relevance_score': relevance,
+            'message_volume': message_count,
+            'creator': 'Piet Weinman',
+            'type': 'chatgpt',
+            'url': f"https://chat.openai.com/c/{i:06d}"
+        }
+        
+    except Exception as e:
+        print(f"  ⚠️ Error processing conversation {i}: {str(e)[:50]}")
+        return None
+
+def build_conversations_parallel(read_fields, records, workers, chunksize=64):
+    """Read and analyze records in a process pool, in input order
+    
+    Workers read each record's fields; repeats are dropped here and only
+    unique conversations go back to the workers for enrichment.
+    """
+    batch_size = chunksize * workers * 2
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        fields = _map_batched(executor, read_record,
+                              zip(repeat(read_fields), count(), records),
+                              batch_size, chunksize)
+        yield from _map_batched(executor, build_conversation, unique_fields(fields),
+                                batch_size, chunksize)
+
+def _map_batched(executor, fn, arg_tuples, batch_size, chunksize):
+    """executor.map fn over argument tuples, batch_size at a time in input order
+    
+    Batching keeps only a few records in flight at once.
+    """
+    arg_tuples = iter(arg_tuples)
+    while True:
+        batch = list(islice(arg_tuples, batch_size))
+        if not batch:
+            break
+        yield from executor.map(fn, *zip(*batch), chunksize=chunksize)
+
+def load_json_export(content):
+    """Parse content as a complete JSON export, or return None if it isn't one"""
+    
+    if content[:1] not in (b'[', b'{'):
+        return None
+    try:
+        data = json_loads(content)
+    except ValueError:
+        return None  # Split export cut mid-record
+    
+    if isinstance(data, dict):  # Single conversation
+        data = [data]
+    return data if isinstance(data, list) else None
+
+def json_conversation_fields(conv):
+    """Read (title, create_time, messages, message_count) from one parsed JSON conversation"""
+    
+    if not isinstance(conv, dict):
+        return None
+    title = conv.get('title') or ''
+    
+    timestamp = conv.get('create_time')
+    if not isinstance(timestamp, (int, float)):
+        timestamp = None
+    
+    # Walk the mapping tree for message parts (already unescaped by the parser)
+    parts = []
+    contents = []
+    mapping = conv.get('mapping')
+    for node in (mapping.values() if isinstance(mapping, dict) else ()):
+        content = ((node or {}).get('message') or {}).get('content')
+        if isinstance(content, dict):
+            node_parts = content.get('parts') or []
+            if node_parts and isinstance(node_parts[0], str):
+                parts.append(node_parts[0])
+        elif isinstance(content, str):
+            contents.append(content)
+    
+    messages = [msg for msg in parts
+                if len(msg) > 30 and not msg.startswith('You are')]
+    if not messages:
+        messages = [msg for msg in contents if len(msg) > 30]
+    
+    # Descriptions only look at the first few messages; the rest are counted
+    return title, timestamp, [msg[:200] for msg in messages[:MESSAGE_SAMPLE]], len(messages)
+
+def split_raw_records(content):
+    """Split a raw text export on its "title": markers
+    
+    Returns the record count and a generator slicing out one record at a
+    time, so the records are never all copied out of content at once.
+    """
+    bounds = [(m.start(), m.end()) for m in _TITLE_SPLIT_RE.finditer(content)]
+    ends = [start for start, _ in bounds[1:]] + [len(content)]
+    return len(bounds), (content[start:end] for (_, start), end in zip(bounds, ends))
+
+def raw_conversation_fields(part):
+    """Read (title, create_time, messages, message_count) from one raw text record
+    
+    Only the first MESSAGE_SAMPLE messages are kept; the rest are counted.
+    """
+    
+    # Extract title (everything up to next quote)
+    try:
+        title_end = part.index(b'"')
+    except ValueError:
+        return None
+    title = part[:title_end].decode('utf-8')
+    
+    # Clean the title
+    title = json_unescape(title)
+    
+    # Extract create_time
+    timestamp = None
+    create_match = _CREATE_TIME_RE.search(part)
+    if create_match:
+        timestamp = float(create_match.group(1))
+    
+    # Extract actual conversation content (not metadata!)
+    # Look for message content patterns
+    # (decoding and unescaping never lengthen a match, so short ones are skipped)
+    messages = []
+    message_count = 0
+    
+    # Pattern 1: "parts": ["content here"]
+    parts_matches = _PARTS_RE.findall(part)
+    for match in parts_matches:
+        if len(match) <= 30:
+            continue
+        clean_msg = json_unescape(match.decode('utf-8'))
+        if len(clean_msg) > 30 and not clean_msg.startswith('You are'):
+            message_count += 1
+            if len(messages) < MESSAGE_SAMPLE:
+                messages.append(clean_msg[:200])  # Limit each message
+    
+    # Pattern 2: "content": "message here"
+    if not messages:
+        content_matches = _CONTENT_RE.findall(part)
+        for match in content_matches:
+            if len(match) <= 30:
+                continue
+            clean_msg = json_unescape(match.decode('utf-8'))
+            if len(clean_msg) > 30:
+                message_count += 1
+                if len(messages) < MESSAGE_SAMPLE:
+                    messages.append(clean_msg[:200])
+    
+    return title, timestamp, messages, message_count
+
+@lru_cache(maxsize=4096)
+def match_keywords(text):
+    """Return the set of _KEYWORDS found in text, ignoring case
+    
+    Cached, since archives repeat titles and boilerplate descriptions.
+    """
+    text = text.lower()
+    return frozenset(keyword for keyword in _KEYWORDS if keyword in text)
+
 def create_smart_description(title, messages):
     """Create description from actual content, not metadata"""
     
     # Start with title context
     desc_parts = []
-    title_lower = title.lower()
+    hits = match_keywords(title)
     
     # Check for specific project/topic indicators
-    if 'valentina' in title_lower or 'sage' in title_lower:
+    if 'valentina' in hits or 'sage' in hits:
         desc_parts.append("GTR AI persona development")
-    elif 'emma' in title_lower or 'tnt' in title_lower:
+    elif 'emma' in hits or 'tnt' in hits:
         desc_parts.append("TNT Media brand strategy")
-    elif 'resume' in title_lower or 'portfolio' in title_lower:
+    elif 'resume' in hits or 'portfolio' in hits:
         desc_parts.append("Job application materials")
-    elif 'email' in title_lower:
+    elif 'email' in hits:
         desc_parts.append("Email copywriting")
-    elif 'prompt' in title_lower:
+    elif 'prompt' in hits:
         desc_parts.append("Prompt engineering")
     
     # Add content from actual messages if available
     if messages:
         # Use first meaningful message
-        for msg in messages[:3]:
+        for msg in messages[:MESSAGE_SAMPLE]:
             if len(msg) > 50:
                 # Extract key part of message
                 clean_msg = msg.strip()
@@ -149,28 +372,29 @@ def create_smart_description(title, messages):
     
     return description[:300]  # Limit to 300 chars
 
-def determine_category(title, description):
+def determine_category(title, description, hits=None):
     """Determine categories based on content"""
     
     categories = []
-    content = f"{title} {description}".lower()
+    if hits is None:
+        hits = match_keywords(f"{title} {description}")
     
     # Category mapping
-    if 'valentina' in content or 'sage' in content or 'gtr' in content:
+    if 'valentina' in hits or 'sage' in hits or 'gtr' in hits:
         categories.append("Project – Get The Receipts (GTR)")
-    if 'emma' in content or 'tnt' in content:
+    if 'emma' in hits or 'tnt' in hits:
         categories.append("Project – TNT Media")
-    if 'prompt' in content:
+    if 'prompt' in hits:
         categories.append("Prompt Engineering")
-    if 'email' in content and ('sequence' in content or 'campaign' in content):
+    if 'email' in hits and ('sequence' in hits or 'campaign' in hits):
         categories.append("Copywriting - Emails")
-    if 'job' in content or 'resume' in content or 'portfolio' in content:
+    if 'job' in hits or 'resume' in hits or 'portfolio' in hits:
         categories.append("Job - Copywriting")
-    if 'ai' in content and ('bot' in content or 'assistant' in content):
+    if 'ai' in hits and ('bot' in hits or 'assistant' in hits):
         categories.append("AI Bot Configurations")
-    if 'strategy' in content or 'framework' in content:
+    if 'strategy' in hits or 'framework' in hits:
         categories.append("Business Strategy")
-    if 'research' in content:
+    if 'research' in hits:
         categories.append("Customer Research")
     
     if not categories:
@@ -178,42 +402,43 @@ def determine_category(title, description):
     
     return categories[:3]  # Max 3 categories
 
-def generate_tags(title, description):
+def generate_tags(title, description, hits=None):
     """Generate specific tags"""
     
     tags = set()
-    content = f"{title} {description}".lower()
+    if hits is None:
+        hits = match_keywords(f"{title} {description}")
     
     # Project tags
-    if 'valentina' in content:
+    if 'valentina' in hits:
         tags.add("Valentina")
-    if 'sage' in content:
+    if 'sage' in hits:
         tags.add("Sage")
-    if 'emma' in content:
+    if 'emma' in hits:
         tags.add("Emma Brand")
-    if 'tnt' in content:
+    if 'tnt' in hits:
         tags.add("TNT")
     
     # Tool tags
-    if 'claude' in content:
+    if 'claude' in hits:
         tags.add("Claude")
-    if 'gpt' in content or 'chatgpt' in content:
+    if 'gpt' in hits or 'chatgpt' in hits:
         tags.add("ChatGPT")
-    if 'n8n' in content:
+    if 'n8n' in hits:
         tags.add("n8n")
     
     # Work type tags
-    if 'prompt' in content:
+    if 'prompt' in hits:
         tags.add("Prompt")
-    if 'email' in content:
+    if 'email' in hits:
         tags.add("Email")
-    if 'strategy' in content:
+    if 'strategy' in hits:
         tags.add("Strategy")
-    if 'research' in content:
+    if 'research' in hits:
         tags.add("Research")
-    if 'framework' in content:
+    if 'framework' in hits:
         tags.add("Framework")
-    if 'automation' in content:
+    if 'automation' in hits:
         tags.add("Automation")
     
     if not tags:
@@ -231,8 +456,7 @@ def calculate_relevance(title, categories, message_count):
         score += 0.2
     
     # Boost for specific work types
-    if any(cat in categories for cat in ["Prompt Engineering", "Business Strategy", 
-                                          "Copywriting - Emails", "AI Bot Configurations"]):
+    if not _WORK_TYPE_CATEGORIES.isdisjoint(categories):
         score += 0.15
     
     # Boost for longer conversations
@@ -250,90 +474,108 @@ def calculate_relevance(title, categories, message_count):
 def save_to_csv(conversations, output_prefix="gemini_ready"):
     """Save to CSV files optimized for Gemini"""
     
-    # Convert to CSV format
-    csv_data = []
-    for conv in conversations:
-        csv_data.append({
-            'name': conv['name'],
-            'description': conv['description'],
-            'category': '|'.join(conv['category']),  # Pipe separator for multiple
-            'tags': ','.join(conv['tags']),  # Comma separator for tags
-            'date': conv['date'],
-            'date_source': conv['date_source'],
-            'relevance_score': conv['relevance_score'],
-            'message_volume': conv['message_volume'],
-            'creator': conv['creator'],
-            'type': conv['type'],
-            'url': conv['url']
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(csv_data)
+    # Convert to CSV format, one column at a time rather than a dict per row
+    columns = {key: [conv[key] for conv in conversations] for key in CSV_COLUMNS}
+    columns['category'] = ['|'.join(cats) for cats in columns['category']]  # Pipe separator for multiple
+    columns['tags'] = [','.join(tags) for tags in columns['tags']]  # Comma separator for tags
     
     # Split into chunks of 500
     chunk_size = 500
-    num_chunks = (len(df) + chunk_size - 1) // chunk_size
+    num_chunks = (len(conversations) + chunk_size - 1) // chunk_size
     
     output_files = []
     for i in range(num_chunks):
         start_idx = i * chunk_size
-        end_idx = min((i + 1) * chunk_size, len(df))
-        chunk_df = df.iloc[start_idx:end_idx]
+        end_idx = min((i + 1) * chunk_size, len(conversations))
         
         filename = f"{output_prefix}_chunk_{i+1:03d}.csv"
-        chunk_df.to_csv(filename, index=False, quoting=csv.QUOTE_MINIMAL)
+        with open(filename, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows(zip(*(columns[key][start_idx:end_idx] for key in CSV_COLUMNS)))
         output_files.append(filename)
         
-        file_size = len(chunk_df)
+        file_size = end_idx - start_idx
         print(f"  💾 Saved {filename}: {file_size} records")
     
     return output_files
 
-def create_quick_report(conversations):
-    """Create a quick summary report"""
+def new_quick_report():
+    """Start empty quick report statistics, filled in while parsing"""
+    return {
+        'total': 0,
+        'earliest': None,
+        'latest': None,
+        'categories': Counter(),
+        'tags': Counter(),
+        'high': 0,
+        'medium': 0,
+        'low': 0
+    }
+
+def update_quick_report(report, conv):
+    """Add one parsed conversation to the quick report statistics"""
+    
+    report['total'] += 1
+    
+    # Date range
+    date = conv['date']
+    if date:
+        if report['earliest'] is None or date < report['earliest']:
+            report['earliest'] = date
+        if report['latest'] is None or date > report['latest']:
+            report['latest'] = date
+    
+    # Category and tag distribution
+    report['categories'].update(conv['category'])
+    report['tags'].update(conv['tags'])
+    
+    # Relevance distribution
+    score = conv['relevance_score']
+    if score >= 0.8:
+        report['high'] += 1
+    elif score >= 0.5:
+        report['medium'] += 1
+    else:
+        report['low'] += 1
+
+def create_quick_report(conversations, report=None):
+    """Create a quick summary report
+    
+    Pass the report filled in by quick_parse_conversations to skip
+    another pass over the conversations.
+    """
+    
+    if report is None:
+        report = new_quick_report()
+        for conv in conversations:
+            update_quick_report(report, conv)
     
     print("\n📊 Quick Analysis Report:")
-    print(f"  Total Conversations: {len(conversations)}")
+    print(f"  Total Conversations: {report['total']}")
     
     # Date range
-    dates = [c['date'] for c in conversations if c['date']]
-    if dates:
-        print(f"  Date Range: {min(dates)} to {max(dates)}")
+    if report['earliest'] is not None:
+        print(f"  Date Range: {report['earliest']} to {report['latest']}")
     
     # Category distribution
-    cat_counts = {}
-    for conv in conversations:
-        for cat in conv['category']:
-            cat_counts[cat] = cat_counts.get(cat, 0) + 1
-    
     print("\n  Top Categories:")
-    for cat, count in sorted(cat_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
+    for cat, count in report['categories'].most_common(5):
         print(f"    - {cat}: {count}")
     
     # Tag distribution
-    tag_counts = {}
-    for conv in conversations:
-        for tag in conv['tags']:
-            tag_counts[tag] = tag_counts.get(tag, 0) + 1
-    
     print("\n  Top Tags:")
-    for tag, count in sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
+    for tag, count in report['tags'].most_common(5):
         print(f"    - {tag}: {count}")
     
     # Relevance distribution
-    high_rel = sum(1 for c in conversations if c['relevance_score'] >= 0.8)
-    med_rel = sum(1 for c in conversations if 0.5 <= c['relevance_score'] < 0.8)
-    low_rel = sum(1 for c in conversations if c['relevance_score'] < 0.5)
-    
     print(f"\n  Relevance Distribution:")
-    print(f"    - High (0.8+): {high_rel}")
-    print(f"    - Medium (0.5-0.7): {med_rel}")
-    print(f"    - Low (<0.5): {low_rel}")
+    print(f"    - High (0.8+): {report['high']}")
+    print(f"    - Medium (0.5-0.7): {report['medium']}")
+    print(f"    - Low (<0.5): {report['low']}")
 
 # Main execution
 if __name__ == "__main__":
-    import sys
-    
     print("🚀 Quick Conversation Converter")
     print("=" * 50)
     
@@ -345,7 +587,8 @@ if __name__ == "__main__":
         print(f"No input file specified, looking for {input_file}")
     
     # Parse conversations
-    conversations = quick_parse_conversations(input_file)
+    report = new_quick_report()
+    conversations = quick_parse_conversations(input_file, report=report)
     
     if not conversations:
         print("❌ No conversations found. Check the file format.")
@@ -356,7 +599,7 @@ if __name__ == "__main__":
     output_files = save_to_csv(conversations)
     
     # Create report
-    create_quick_report(conversations)
+    create_quick_report(conversations, report)
     
     print(f"\n✅ Complete! Created {len(output_files)} CSV files")
     print("📤 Ready to import into Gemini!")
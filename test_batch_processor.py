@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Regression checks for the batch processor
+Run with: python -m unittest test_batch_processor
+"""
+
+import os
+import json
+import tempfile
+import unittest
+
+from batch_processor import process_multiple_files
+
+# Two distinct conversations in ChatGPT export form
+SAMPLE_EXPORT = [
+    {
+        "title": "Email sequence for the GTR quiz funnel",
+        "create_time": 1761376400.31522,
+        "mapping": {"n0": {"message": {"content": {"parts": [
+            "Write a five part email sequence that follows up on the GTR quiz results."
+        ]}}}}
+    },
+    {
+        "title": "Landing page framework",
+        "create_time": 1761476400.5,
+        "mapping": {"n0": {"message": {"content": {"parts": [
+            "Outline a landing page framework for the TNT Media brand launch."
+        ]}}}}
+    }
+]
+
+class DuplicateExportTest(unittest.TestCase):
+    """The same chat exported twice must not abort a batch run"""
+    
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._dir = tempfile.TemporaryDirectory()
+        os.chdir(self._dir.name)
+        
+        # conv_part_ab.txt is entirely duplicates of conv_part_aa.txt
+        for name in ("conv_part_aa.txt", "conv_part_ab.txt"):
+            with open(name, 'w', encoding='utf-8') as f:
+                json.dump(SAMPLE_EXPORT, f)
+    
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._dir.cleanup()
+    
+    def test_all_duplicate_file_with_near_dup_filter(self):
+        output_files = process_multiple_files("conv_part_*.txt", near_dup_threshold=0.9)
+        self.assertEqual(output_files, ["complete_archive_chunk_001.csv"])
+        
+        with open(output_files[0], encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 1 + len(SAMPLE_EXPORT))
+
+if __name__ == "__main__":
+    unittest.main()